@@ -221,7 +221,7 @@ Respond in JSON format with:
                 arguments = tool_call.get("arguments", {})
 
                 # Risk assessment
-                risk_level = await self.risk_assessor.assess_tool_call(tool_name, arguments)
+                risk_level = self.risk_assessor.assess_tool_call(tool_name, arguments)
 
                 # Check if confirmation required
                 if risk_level in ["medium", "high"] and self.config.require_confirmation:
@@ -4,12 +4,20 @@ Provides standardized tools for system administration
 """
 
 import asyncio
+import contextvars
+import functools
 import json
 import logging
 import os
+import re
+import shlex
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
 
 import psutil
 from mcp.server import Server
@@ -23,6 +31,42 @@ from mcp.types import (
     INTERNAL_ERROR
 )
 
+try:
+    import orjson
+
+    def _json_default(obj: Any) -> Any:
+        """Render tuples (psutil namedtuples included) as JSON arrays,
+        matching the stdlib encoder, instead of letting them fall
+        through to a str() repr"""
+        if isinstance(obj, tuple):
+            return list(obj)
+        return str(obj)
+
+    def _dumps(obj: Any) -> str:
+        """Serialize tool results with the C-accelerated orjson encoder"""
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2, default=_json_default
+        ).decode()
+
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        """Serialize tool results with the stdlib json encoder"""
+        return json.dumps(obj, indent=2, default=str)
+
+
+def _text(s: str) -> List[TextContent]:
+    """Wrap a string in the single-item TextContent list MCP expects"""
+    return [TextContent(type="text", text=s)]
+
+
+# Static responses shared across calls so hot error paths allocate nothing
+_SERVICE_TIMEOUT_RESP = _text("Service operation timed out")
+_LOG_TIMEOUT_RESP = _text("Log retrieval timed out")
+_NETWORK_TIMEOUT_RESP = _text("Network operation timed out")
+_COMMAND_TIMEOUT_RESP = _text("Command execution timed out")
+_INVALID_SERVICE_RESP = _text("Invalid service name")
+_COMMAND_BLOCKED_RESP = _text("Command blocked for safety reasons")
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +75,81 @@ logger = logging.getLogger("mcp-server")
 # Initialize server
 server = Server("linux-system-tools")
 
+# Valid systemd unit names: ASCII alphanumerics plus ._- with a sane length cap
+_SVC_RE = re.compile(r'\A[A-Za-z0-9._-]{1,256}\Z')
+
+# Per-tool-call snapshot cache so one request sees a consistent system view
+# without re-reading /proc for every psutil counter (mirrors psutil.oneshot())
+_snapshot: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "psutil_snapshot", default=None
+)
+
+
+@asynccontextmanager
+async def snapshot():
+    """Scope a psutil snapshot cache to the enclosed tool call"""
+    token = _snapshot.set({})
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+
+def _snapshot_cached(key: str, fn: Callable[[], Any]) -> Any:
+    """Return fn() memoized in the active snapshot, or call through if none"""
+    cache = _snapshot.get()
+    if cache is None:
+        return fn()
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
+def cached_cpu_times() -> Any:
+    """psutil.cpu_times() reused within the current snapshot"""
+    return _snapshot_cached("cpu_times", psutil.cpu_times)
+
+
+def cached_virtual_memory() -> Any:
+    """psutil.virtual_memory() reused within the current snapshot"""
+    return _snapshot_cached("virtual_memory", psutil.virtual_memory)
+
+
+def _ttl_cache(ttl: float):
+    """Memoize a zero-argument function for ttl seconds.
+
+    A refresh lock ensures only one caller repopulates an expired entry;
+    the rest keep serving the previous value until the refresh lands.
+    """
+    def decorator(fn):
+        lock = threading.Lock()
+        state = {"expires_at": 0.0, "value": None}
+
+        @functools.wraps(fn)
+        def wrapper():
+            if time.monotonic() < state["expires_at"]:
+                return state["value"]
+            with lock:
+                if time.monotonic() >= state["expires_at"]:
+                    state["value"] = fn()
+                    state["expires_at"] = time.monotonic() + ttl
+                return state["value"]
+
+        return wrapper
+    return decorator
+
+
+# Interface and partition tables walk /sys and /proc/mounts on every read
+# but rarely change; a short TTL keeps repeated requests off the filesystem
+@_ttl_cache(ttl=5.0)
+def _net_if_addrs() -> Dict[str, Any]:
+    return psutil.net_if_addrs()
+
+
+@_ttl_cache(ttl=5.0)
+def _disk_partitions() -> List[Any]:
+    return psutil.disk_partitions()
+
 
 @server.list_tools()
 async def handle_list_tools() -> List[Tool]:
@@ -229,28 +348,34 @@ async def handle_list_tools() -> List[Tool]:
 async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
     """Handle tool execution"""
     try:
-        if name == "get_system_info":
-            return await get_system_info(arguments or {})
-        elif name == "monitor_processes":
-            return await monitor_processes(arguments or {})
-        elif name == "manage_service":
-            return await manage_service(arguments or {})
-        elif name == "check_logs":
-            return await check_logs(arguments or {})
-        elif name == "file_operations":
-            return await file_operations(arguments or {})
-        elif name == "network_diagnostics":
-            return await network_diagnostics(arguments or {})
-        elif name == "disk_management":
-            return await disk_management(arguments or {})
-        elif name == "execute_command":
-            return await execute_command(arguments or {})
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        async with snapshot():
+            return await _dispatch_tool(name, arguments)
 
     except Exception as e:
         logger.error(f"Error executing tool {name}: {e}")
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+        return _text(f"Error: {str(e)}")
+
+
+async def _dispatch_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
+    """Route a tool call to its handler"""
+    if name == "get_system_info":
+        return await get_system_info(arguments or {})
+    elif name == "monitor_processes":
+        return await monitor_processes(arguments or {})
+    elif name == "manage_service":
+        return await manage_service(arguments or {})
+    elif name == "check_logs":
+        return await check_logs(arguments or {})
+    elif name == "file_operations":
+        return await file_operations(arguments or {})
+    elif name == "network_diagnostics":
+        return await network_diagnostics(arguments or {})
+    elif name == "disk_management":
+        return await disk_management(arguments or {})
+    elif name == "execute_command":
+        return await execute_command(arguments or {})
+    else:
+        raise ValueError(f"Unknown tool: {name}")
 
 
 async def get_system_info(args: Dict[str, Any]) -> List[TextContent]:
@@ -260,7 +385,7 @@ async def get_system_info(args: Dict[str, Any]) -> List[TextContent]:
     try:
         # Basic system info
         cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
+        memory = cached_virtual_memory()
         disk = psutil.disk_usage('/')
 
         boot_time = psutil.boot_time()
@@ -287,16 +412,48 @@ async def get_system_info(args: Dict[str, Any]) -> List[TextContent]:
             info.update({
                 "cpu_count": psutil.cpu_count(),
                 "cpu_count_logical": psutil.cpu_count(logical=True),
+                "cpu_times": cached_cpu_times()._asdict(),
                 "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else "N/A",
                 "swap": psutil.swap_memory()._asdict(),
                 "network_io": psutil.net_io_counters()._asdict(),
                 "disk_io": psutil.disk_io_counters()._asdict() if psutil.disk_io_counters() else "N/A"
             })
 
-        return [TextContent(type="text", text=json.dumps(info, indent=2, default=str))]
+        return _text(_dumps(info))
 
     except Exception as e:
-        return [TextContent(type="text", text=f"Error getting system info: {str(e)}")]
+        return _text(f"Error getting system info: {str(e)}")
+
+
+# Window during which concurrent monitor_processes calls share one /proc scan
+_SNAPSHOT_BATCH_WINDOW = 0.1
+
+_process_snapshot_future: Optional[asyncio.Future] = None
+
+
+async def _collect_process_snapshot() -> List[Dict[str, Any]]:
+    """Scan /proc once on behalf of every request batched in this window"""
+    await asyncio.sleep(_SNAPSHOT_BATCH_WINDOW)
+
+    snapshot = []
+    for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
+        try:
+            snapshot.append(proc.info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+    return snapshot
+
+
+async def _get_process_snapshot() -> List[Dict[str, Any]]:
+    """Coalesce overlapping snapshot requests onto a single scan task"""
+    global _process_snapshot_future
+    if _process_snapshot_future is None or _process_snapshot_future.done():
+        _process_snapshot_future = asyncio.ensure_future(_collect_process_snapshot())
+    # shield: a waiter cancelled mid-await (client disconnect cancels the
+    # MCP request task) must not cancel the shared scan and poison every
+    # other waiter batched on the same future
+    return await asyncio.shield(_process_snapshot_future)
 
 
 async def monitor_processes(args: Dict[str, Any]) -> List[TextContent]:
@@ -306,15 +463,15 @@ async def monitor_processes(args: Dict[str, Any]) -> List[TextContent]:
         sort_by = args.get("sort_by", "cpu")
         limit = args.get("limit", 10)
 
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-            try:
-                pinfo = proc.info
-                if filter_name and filter_name.lower() not in pinfo['name'].lower():
-                    continue
-                processes.append(pinfo)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        snapshot = await _get_process_snapshot()
+
+        # Apply the caller's filter to a private copy; the snapshot is shared
+        # by every request batched into the same scan
+        if filter_name:
+            filter_lower = filter_name.lower()
+            processes = [p for p in snapshot if filter_lower in p['name'].lower()]
+        else:
+            processes = list(snapshot)
 
         # Sort processes
         sort_key_map = {
@@ -330,10 +487,10 @@ async def monitor_processes(args: Dict[str, Any]) -> List[TextContent]:
         # Limit results
         processes = processes[:limit]
 
-        return [TextContent(type="text", text=json.dumps(processes, indent=2))]
+        return _text(_dumps(processes))
 
     except Exception as e:
-        return [TextContent(type="text", text=f"Error monitoring processes: {str(e)}")]
+        return _text(f"Error monitoring processes: {str(e)}")
 
 
 async def manage_service(args: Dict[str, Any]) -> List[TextContent]:
@@ -343,8 +500,8 @@ async def manage_service(args: Dict[str, Any]) -> List[TextContent]:
         action = args["action"]
 
         # Validate service name
-        if not service_name.replace("-", "").replace("_", "").replace(".", "").isalnum():
-            return [TextContent(type="text", text="Invalid service name")]
+        if not _SVC_RE.match(service_name):
+            return _INVALID_SERVICE_RESP
 
         cmd = ["systemctl", action, service_name]
 
@@ -356,12 +513,12 @@ async def manage_service(args: Dict[str, Any]) -> List[TextContent]:
         )
 
         output = result.stdout + result.stderr
-        return [TextContent(type="text", text=f"Service {action} result:\n{output}")]
+        return _text(f"Service {action} result:\n{output}")
 
     except subprocess.TimeoutExpired:
-        return [TextContent(type="text", text="Service operation timed out")]
+        return _SERVICE_TIMEOUT_RESP
     except Exception as e:
-        return [TextContent(type="text", text=f"Error managing service: {str(e)}")]
+        return _text(f"Error managing service: {str(e)}")
 
 
 async def check_logs(args: Dict[str, Any]) -> List[TextContent]:
@@ -386,12 +543,12 @@ async def check_logs(args: Dict[str, Any]) -> List[TextContent]:
             timeout=30
         )
 
-        return [TextContent(type="text", text=result.stdout)]
+        return _text(result.stdout)
 
     except subprocess.TimeoutExpired:
-        return [TextContent(type="text", text="Log retrieval timed out")]
+        return _LOG_TIMEOUT_RESP
     except Exception as e:
-        return [TextContent(type="text", text=f"Error checking logs: {str(e)}")]
+        return _text(f"Error checking logs: {str(e)}")
 
 
 async def file_operations(args: Dict[str, Any]) -> List[TextContent]:
@@ -401,30 +558,46 @@ async def file_operations(args: Dict[str, Any]) -> List[TextContent]:
         path = args["path"]
 
         if operation == "list":
-            if os.path.exists(path):
-                items = os.listdir(path)
-                return [TextContent(type="text", text=json.dumps(items, indent=2))]
-            else:
-                return [TextContent(type="text", text=f"Path does not exist: {path}")]
+            # EAFP: let scandir raise instead of stat-ing the path first.
+            # DirEntry serves stat data cached from the readdir pass, so no
+            # per-entry stat() syscall is issued either
+            try:
+                with os.scandir(path) as it:
+                    items = [
+                        {
+                            "name": entry.name,
+                            "is_dir": entry.is_dir(follow_symlinks=False),
+                            "size": entry.stat(follow_symlinks=False).st_size
+                        }
+                        for entry in it
+                    ]
+            except FileNotFoundError:
+                return _text(f"Path does not exist: {path}")
+            return _text(_dumps(items))
 
         elif operation == "create":
-            if os.path.exists(path):
-                return [TextContent(type="text", text=f"Path already exists: {path}")]
-
             if path.endswith('/'):
-                os.makedirs(path, exist_ok=True)
-                return [TextContent(type="text", text=f"Directory created: {path}")]
+                try:
+                    os.makedirs(path)
+                except FileExistsError:
+                    return _text(f"Path already exists: {path}")
+                return _text(f"Directory created: {path}")
             else:
                 os.makedirs(os.path.dirname(path), exist_ok=True)
-                with open(path, 'w') as f:
-                    f.write("")
-                return [TextContent(type="text", text=f"File created: {path}")]
+                try:
+                    # Exclusive create checks existence and creates atomically,
+                    # closing the exists()-then-open() TOCTOU window
+                    with open(path, 'x'):
+                        pass
+                except FileExistsError:
+                    return _text(f"Path already exists: {path}")
+                return _text(f"File created: {path}")
 
         else:
-            return [TextContent(type="text", text=f"Operation {operation} not yet implemented")]
+            return _text(f"Operation {operation} not yet implemented")
 
     except Exception as e:
-        return [TextContent(type="text", text=f"Error in file operation: {str(e)}")]
+        return _text(f"Error in file operation: {str(e)}")
 
 
 async def network_diagnostics(args: Dict[str, Any]) -> List[TextContent]:
@@ -438,24 +611,24 @@ async def network_diagnostics(args: Dict[str, Any]) -> List[TextContent]:
 
             cmd = ["ping", "-c", str(count), target]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            return [TextContent(type="text", text=result.stdout)]
+            return _text(result.stdout)
 
         elif operation == "interfaces":
-            interfaces = psutil.net_if_addrs()
-            return [TextContent(type="text", text=json.dumps(interfaces, indent=2, default=str))]
+            interfaces = _net_if_addrs()
+            return _text(_dumps(interfaces))
 
         elif operation == "netstat":
             cmd = ["netstat", "-tuln"]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            return [TextContent(type="text", text=result.stdout)]
+            return _text(result.stdout)
 
         else:
-            return [TextContent(type="text", text=f"Network operation {operation} not yet implemented")]
+            return _text(f"Network operation {operation} not yet implemented")
 
     except subprocess.TimeoutExpired:
-        return [TextContent(type="text", text="Network operation timed out")]
+        return _NETWORK_TIMEOUT_RESP
     except Exception as e:
-        return [TextContent(type="text", text=f"Error in network diagnostics: {str(e)}")]
+        return _text(f"Error in network diagnostics: {str(e)}")
 
 
 async def disk_management(args: Dict[str, Any]) -> List[TextContent]:
@@ -475,12 +648,12 @@ async def disk_management(args: Dict[str, Any]) -> List[TextContent]:
                     "free": usage.free,
                     "percent": (usage.used / usage.total) * 100
                 }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+                return _text(_dumps(result))
             else:
-                return [TextContent(type="text", text=f"Path does not exist: {path}")]
+                return _text(f"Path does not exist: {path}")
 
         elif operation == "free":
-            partitions = psutil.disk_partitions()
+            partitions = _disk_partitions()
             result = []
 
             for partition in partitions:
@@ -498,13 +671,17 @@ async def disk_management(args: Dict[str, Any]) -> List[TextContent]:
                 except PermissionError:
                     continue
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return _text(_dumps(result))
 
         else:
-            return [TextContent(type="text", text=f"Disk operation {operation} not yet implemented")]
+            return _text(f"Disk operation {operation} not yet implemented")
 
     except Exception as e:
-        return [TextContent(type="text", text=f"Error in disk management: {str(e)}")]
+        return _text(f"Error in disk management: {str(e)}")
+
+
+# Characters that require a shell to interpret; anything else runs via exec
+_SHELL_METACHARS = set(';|&><`$*?[]{}()')
 
 
 async def execute_command(args: Dict[str, Any]) -> List[TextContent]:
@@ -517,32 +694,104 @@ async def execute_command(args: Dict[str, Any]) -> List[TextContent]:
         # Basic safety checks
         dangerous_commands = ["rm -rf /", "dd if=", "mkfs", "fdisk", ":(){ :|:& };:"]
         if any(dangerous in command for dangerous in dangerous_commands):
-            return [TextContent(type="text", text="Command blocked for safety reasons")]
+            return _COMMAND_BLOCKED_RESP
+
+        async with _get_exec_semaphore():
+            if _SHELL_METACHARS & set(command):
+                # Shell features requested; pay for the /bin/sh hop
+                proc = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=working_dir
+                )
+            else:
+                # Plain argv command: skip the shell fork+exec entirely
+                proc = await asyncio.create_subprocess_exec(
+                    *shlex.split(command),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=working_dir
+                )
 
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=working_dir
-        )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.communicate()
+                return _COMMAND_TIMEOUT_RESP
 
-        output = f"Exit code: {result.returncode}\n"
-        output += f"STDOUT:\n{result.stdout}\n"
-        if result.stderr:
-            output += f"STDERR:\n{result.stderr}"
+        output = f"Exit code: {proc.returncode}\n"
+        output += f"STDOUT:\n{stdout.decode(errors='replace')}\n"
+        if stderr:
+            output += f"STDERR:\n{stderr.decode(errors='replace')}"
 
-        return [TextContent(type="text", text=output)]
+        return _text(output)
 
-    except subprocess.TimeoutExpired:
-        return [TextContent(type="text", text="Command execution timed out")]
     except Exception as e:
-        return [TextContent(type="text", text=f"Error executing command: {str(e)}")]
+        return _text(f"Error executing command: {str(e)}")
+
+
+# Default sizing for concurrent tool-call fan-out; asyncio's default pool
+# is only min(32, cpu_count + 4) and saturates under bursts of to_thread
+# offloads. Overridden by Config.thread_pool_workers when a config is
+# available (see _executor_workers)
+_EXECUTOR_WORKERS = 32
+
+
+def _executor_workers() -> int:
+    """Resolve the tool thread-pool size, preferring the shared config.
+
+    The server also runs standalone — outside the installed package or
+    without GEMINI_API_KEY set — where Config.from_env() is unavailable
+    or raises; those cases fall back to the module default.
+    """
+    try:
+        from ..utils.config import get_config
+        return get_config().thread_pool_workers
+    except (ImportError, ValueError):
+        return _EXECUTOR_WORKERS
+
+# Cap on concurrently forked subprocesses from execute_command
+_MAX_CONCURRENT_COMMANDS = 16
+
+_exec_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_exec_semaphore() -> asyncio.Semaphore:
+    """Lazily create the subprocess concurrency cap on the running loop"""
+    global _exec_semaphore
+    if _exec_semaphore is None:
+        _exec_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_COMMANDS)
+    return _exec_semaphore
+
+
+def _prime_cpu_percent() -> None:
+    """Prime per-process CPU counters so the first monitor_processes call
+    returns real percentages instead of 0.0 for every process.
+
+    psutil caches Process instances across process_iter() calls, so the
+    per-pid cpu_times sampled here are reused as the delta baseline by
+    later calls without re-reading /proc/<pid>/stat twice per request.
+    """
+    for proc in psutil.process_iter():
+        try:
+            proc.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
 
 
 async def main():
     """Main server entry point"""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=_executor_workers(), thread_name_prefix="mcp-tool"
+        )
+    )
+
+    _prime_cpu_percent()
+
     # Run the server using stdin/stdout streams
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
@@ -5,20 +5,37 @@ Provides multi-layer security checks and risk evaluation
 
 import re
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set
-from enum import Enum
+from enum import IntEnum
 
 from pydantic import BaseModel
 
+try:
+    import ahocorasick  # optional: single-pass multi-pattern matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # optional: single-DFA scan of all rule patterns
+except ImportError:
+    hyperscan = None
+
 from ..utils.config import Config
 
 
-class RiskLevel(Enum):
-    """Risk levels for operations"""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+class RiskLevel(IntEnum):
+    """Risk levels for operations, ordered so escalation is integer max()"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+    @property
+    def label(self) -> str:
+        """API-facing lowercase name ("low", "medium", "high", "critical")"""
+        return self.name.lower()
 
 
 class SecurityRule(BaseModel):
@@ -30,14 +47,82 @@ class SecurityRule(BaseModel):
     whitelist: List[str] = []
 
 
-class RiskAssessment(BaseModel):
-    """Risk assessment result"""
-    risk_level: RiskLevel
-    reasons: List[str]
+@dataclass
+class RiskAssessment:
+    """Risk assessment result.
+
+    Internal bookkeeping only, so a plain dataclass: no pydantic
+    validation on the per-call construction in the assessment hot path.
+    """
+    risk_level: RiskLevel = RiskLevel.LOW
+    reasons: List[str] = field(default_factory=list)
     blocked: bool = False
     requires_confirmation: bool = False
 
 
+# Command injection indicators (chaining, piping, backticks, conditional
+# execution, command substitution) folded into one pattern; search stops
+# at the first offending character instead of consuming to end-of-string
+_INJECTION_RE = re.compile(r"[;|`]|&&|\$\(")
+
+# Pseudo-rule name under which injection hits are reported by the fused
+# command scan (kept out of the SecurityRule list: it escalates rather
+# than setting an absolute level)
+_INJECTION_CATEGORY = "command_injection"
+
+
+# Per-call collections hoisted to module scope: no per-assessment list or
+# dict construction, and frozenset membership is O(1)
+_TOOL_RISK_LEVELS = {
+    "get_system_info": RiskLevel.LOW,
+    "monitor_processes": RiskLevel.LOW,
+    "check_logs": RiskLevel.LOW,
+    "network_diagnostics": RiskLevel.MEDIUM,
+    "disk_management": RiskLevel.MEDIUM,
+    "file_operations": RiskLevel.MEDIUM,
+    "manage_service": RiskLevel.HIGH,
+    "execute_command": RiskLevel.HIGH
+}
+
+# Critical system paths checked as prefixes of file-operation targets
+# (tuple form feeds a single str.startswith call)
+_CRITICAL_PATHS = (
+    "/etc",
+    "/boot",
+    "/sys",
+    "/proc",
+    "/dev",
+    "/usr/bin",
+    "/usr/sbin",
+    "/bin",
+    "/sbin"
+)
+
+# Services whose stop/disable would cut off access or networking
+_CRITICAL_SERVICES = frozenset({
+    "ssh",
+    "sshd",
+    "networking",
+    "network-manager",
+    "systemd-networkd",
+    "firewall",
+    "iptables"
+})
+
+
+# Bound on memoized (tool, arguments) assessment results per assessor
+_ASSESSMENT_CACHE_SIZE = 1024
+
+
+def _non_capturing(pattern: str) -> str:
+    """Rewrite a rule pattern's bare groups as non-capturing.
+
+    Needed so that match.lastgroup inside the combined alternation always
+    names the rule's own group rather than an inner capturing group.
+    """
+    return re.sub(r"\((?!\?)", "(?:", pattern)
+
+
 class RiskAssessor:
     """
     Multi-layer security risk assessor
@@ -49,67 +134,133 @@ class RiskAssessor:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.security_rules = self._load_security_rules()
         self.dangerous_commands = self._load_dangerous_commands()
+        self._assessment_cache: "OrderedDict[Any, RiskLevel]" = OrderedDict()
+
+        # Frozen once here: O(1) membership instead of a per-call getattr
+        # with default plus a linear list scan
+        self._whitelist = frozenset(
+            getattr(config, 'dangerous_commands_whitelist', ()) or ()
+        )
+
+        # With pyahocorasick installed all dangerous-command needles are
+        # found in one linear scan instead of one substring search each
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for cmd in self.dangerous_commands:
+                automaton.add_word(cmd, cmd)
+            automaton.make_automaton()
+            self._dangerous_ac = automaton
+        else:
+            self._dangerous_ac = None
+
+        # Fuse all rules plus the injection indicators into one alternation
+        # so a command is scanned once instead of once per category; the
+        # named group identifies which rule fired (rule names are already
+        # valid identifiers)
+        self._rules_by_name = {rule.name: rule for rule in self.security_rules}
+        alternation = [
+            f"(?P<{rule.name}>{_non_capturing(rule.pattern)})"
+            for rule in self.security_rules
+        ]
+        alternation.append(f"(?P<{_INJECTION_CATEGORY}>{_INJECTION_RE.pattern})")
+        # Compiled without IGNORECASE: the rule patterns are lowercase
+        # ASCII keywords and the command is lowercased once before the
+        # scan, which is cheaper than per-character case folding inside
+        # the regex engine
+        self._combined_rule_re = re.compile("|".join(alternation))
+
+        # With the hyperscan binding installed the same categories compile
+        # into a single DFA: O(n) over the command with constant work per
+        # byte, regardless of rule count
+        if hyperscan is not None:
+            patterns = [rule.pattern.encode() for rule in self.security_rules]
+            patterns.append(_INJECTION_RE.pattern.encode())
+            self._hs_categories = [rule.name for rule in self.security_rules]
+            self._hs_categories.append(_INJECTION_CATEGORY)
+            db = hyperscan.Database()
+            db.compile(
+                expressions=patterns,
+                ids=list(range(len(patterns)))
+            )
+            self._hs_db = db
+        else:
+            self._hs_db = None
+
+        # Per-tool assessment plans, specialized once: each plan pairs the
+        # tool's base risk with the one sub-assessor relevant to it (or
+        # None), so assessing a call costs a single dict lookup instead of
+        # re-deriving both per call
+        handlers = {
+            "execute_command": self._assess_execute_command,
+            "file_operations": self._assess_file_operation_risks,
+            "manage_service": self._assess_service_risks,
+        }
+        self._plans = {
+            tool: (base_risk, handlers.get(tool))
+            for tool, base_risk in _TOOL_RISK_LEVELS.items()
+        }
+        self._default_plan = (RiskLevel.MEDIUM, None)
 
     def _load_security_rules(self) -> List[SecurityRule]:
         """Load security rules for risk assessment"""
         return [
             SecurityRule(
                 name="destructive_file_operations",
-                pattern=r"rm\s+(-[rf]+|--recursive|--force).*",
+                pattern=r"rm\s+(-[rf]+|--recursive|--force)",
                 risk_level=RiskLevel.HIGH,
                 description="Destructive file deletion operations"
             ),
             SecurityRule(
                 name="system_modification",
-                pattern=r"(sudo|su)\s+.*",
+                pattern=r"(sudo|su)\s+",
                 risk_level=RiskLevel.HIGH,
                 description="Operations requiring elevated privileges"
             ),
             SecurityRule(
                 name="network_operations",
-                pattern=r"(wget|curl|nc|netcat|ssh|scp|rsync).*",
+                pattern=r"(wget|curl|nc|netcat|ssh|scp|rsync)",
                 risk_level=RiskLevel.MEDIUM,
                 description="Network operations that may transfer data"
             ),
             SecurityRule(
                 name="process_manipulation",
-                pattern=r"(kill|killall|pkill)\s+(-9|--kill).*",
+                pattern=r"(kill|killall|pkill)\s+(-9|--kill)",
                 risk_level=RiskLevel.MEDIUM,
                 description="Forceful process termination"
             ),
             SecurityRule(
                 name="disk_operations",
-                pattern=r"(mkfs|fdisk|dd|parted|gparted).*",
+                pattern=r"(mkfs|fdisk|dd|parted|gparted)",
                 risk_level=RiskLevel.CRITICAL,
                 description="Disk partitioning and formatting operations"
             ),
             SecurityRule(
                 name="service_management",
-                pattern=r"systemctl\s+(start|stop|restart|disable).*",
+                pattern=r"systemctl\s+(start|stop|restart|disable)",
                 risk_level=RiskLevel.MEDIUM,
                 description="System service management"
             ),
             SecurityRule(
                 name="package_management",
-                pattern=r"(apt|yum|dnf|pacman|pip)\s+(install|remove|purge).*",
+                pattern=r"(apt|yum|dnf|pacman|pip)\s+(install|remove|purge)",
                 risk_level=RiskLevel.MEDIUM,
                 description="Package installation or removal"
             ),
             SecurityRule(
                 name="cron_manipulation",
-                pattern=r"crontab\s+(-[er]|--edit|--remove).*",
+                pattern=r"crontab\s+(-[er]|--edit|--remove)",
                 risk_level=RiskLevel.MEDIUM,
                 description="Cron job modification"
             ),
             SecurityRule(
                 name="user_management",
-                pattern=r"(useradd|userdel|usermod|passwd|chpasswd).*",
+                pattern=r"(useradd|userdel|usermod|passwd|chpasswd)",
                 risk_level=RiskLevel.HIGH,
                 description="User account management"
             ),
             SecurityRule(
                 name="firewall_changes",
-                pattern=r"(iptables|ufw|firewall-cmd).*",
+                pattern=r"(iptables|ufw|firewall-cmd)",
                 risk_level=RiskLevel.HIGH,
                 description="Firewall configuration changes"
             )
@@ -132,7 +283,7 @@ class RiskAssessor:
             "init 6"
         }
 
-    async def assess_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+    def assess_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """
         Assess risk level of a tool call
 
@@ -143,104 +294,138 @@ class RiskAssessor:
         Returns:
             Risk level as string (low, medium, high, critical)
         """
-        try:
-            assessment = RiskAssessment(
-                risk_level=RiskLevel.LOW,
-                reasons=[]
-            )
+        return self._assess_level(tool_name, arguments).label
 
-            # Check tool-specific risks
-            assessment = await self._assess_tool_specific_risks(tool_name, arguments, assessment)
+    def _assess_level(self, tool_name: str, arguments: Dict[str, Any]) -> RiskLevel:
+        """Assess a tool call, returning the RiskLevel member itself.
 
-            # Check command content if executing commands
-            if tool_name == "execute_command" and "command" in arguments:
-                command = arguments["command"]
-                assessment = await self._assess_command_risks(command, assessment)
+        Internal callers compare levels as integers instead of matching
+        label strings. Results are memoized per (tool, arguments) so the
+        block/confirm checks and agent retry loops do not re-run the full
+        assessment.
+        """
+        key = (tool_name, tuple(sorted((k, repr(v)) for k, v in arguments.items())))
 
-            # Check file operations
-            if tool_name == "file_operations":
-                assessment = await self._assess_file_operation_risks(arguments, assessment)
+        cached = self._assessment_cache.get(key)
+        if cached is not None:
+            self._assessment_cache.move_to_end(key)
+            return cached
 
-            # Check service management
-            if tool_name == "manage_service":
-                assessment = await self._assess_service_risks(arguments, assessment)
+        result = self._assess_uncached(tool_name, arguments)
 
-            self.logger.info(f"Risk assessment for {tool_name}: {assessment.risk_level.value}")
-            return assessment.risk_level.value
+        self._assessment_cache[key] = result
+        if len(self._assessment_cache) > _ASSESSMENT_CACHE_SIZE:
+            self._assessment_cache.popitem(last=False)
 
-        except Exception as e:
-            self.logger.error(f"Error in risk assessment: {e}")
-            return RiskLevel.HIGH.value
+        return result
 
-    async def _assess_tool_specific_risks(
-        self,
-        tool_name: str,
-        arguments: Dict[str, Any],
-        assessment: RiskAssessment
-    ) -> RiskAssessment:
-        """Assess risks specific to tool type"""
-
-        tool_risk_levels = {
-            "get_system_info": RiskLevel.LOW,
-            "monitor_processes": RiskLevel.LOW,
-            "check_logs": RiskLevel.LOW,
-            "network_diagnostics": RiskLevel.MEDIUM,
-            "disk_management": RiskLevel.MEDIUM,
-            "file_operations": RiskLevel.MEDIUM,
-            "manage_service": RiskLevel.HIGH,
-            "execute_command": RiskLevel.HIGH
-        }
+    def _assess_uncached(self, tool_name: str, arguments: Dict[str, Any]) -> RiskLevel:
+        """Run the full assessment pipeline for a tool call.
 
-        base_risk = tool_risk_levels.get(tool_name, RiskLevel.MEDIUM)
+        Everything that can fail (pattern compilation, automaton and plan
+        construction) happens in __init__, so the pipeline runs without a
+        defensive catch-all: a genuine bug surfaces instead of being
+        silently reported as HIGH.
+        """
+        assessment = RiskAssessment()
+
+        base_risk, handler = self._plans.get(tool_name, self._default_plan)
 
-        if base_risk.value == "high" or base_risk.value == "critical":
+        if base_risk >= RiskLevel.HIGH:
             assessment.risk_level = base_risk
             assessment.reasons.append(f"Tool {tool_name} has inherent high risk level")
 
+        # Once an assessment is blocked or critical nothing can lower
+        # it, so the (regex-heavy) sub-assessor is skipped entirely
+        if handler is not None and not self._is_final(assessment):
+            assessment = handler(arguments, assessment)
+
+        self.logger.info("Risk assessment for %s: %s", tool_name, assessment.risk_level.label)
+        return assessment.risk_level
+
+    @staticmethod
+    def _is_final(assessment: RiskAssessment) -> bool:
+        """True when no further sub-assessment can change the outcome"""
+        return assessment.blocked or assessment.risk_level is RiskLevel.CRITICAL
+
+    def _assess_execute_command(
+        self,
+        arguments: Dict[str, Any],
+        assessment: RiskAssessment
+    ) -> RiskAssessment:
+        """Dispatch adapter: assess the command content of execute_command"""
+        if "command" in arguments:
+            return self._assess_command_risks(arguments["command"], assessment)
         return assessment
 
-    async def _assess_command_risks(self, command: str, assessment: RiskAssessment) -> RiskAssessment:
+    def _assess_command_risks(self, command: str, assessment: RiskAssessment) -> RiskAssessment:
         """Assess risks in command execution"""
 
+        # Case-fold once; every scanner below then runs case-sensitively
+        # (dangerous commands and rule patterns are lowercase ASCII)
+        cmd_l = command.lower()
+
         # Check against dangerous command patterns
-        for dangerous_cmd in self.dangerous_commands:
-            if dangerous_cmd in command:
-                assessment.risk_level = RiskLevel.CRITICAL
-                assessment.reasons.append(f"Contains dangerous pattern: {dangerous_cmd}")
-                assessment.blocked = True
-                return assessment
-
-        # Check against security rules
-        for rule in self.security_rules:
-            if re.search(rule.pattern, command, re.IGNORECASE):
-                if rule.risk_level.value == "critical":
-                    assessment.risk_level = RiskLevel.CRITICAL
-                    assessment.blocked = True
-                elif rule.risk_level.value == "high" and assessment.risk_level != RiskLevel.CRITICAL:
-                    assessment.risk_level = RiskLevel.HIGH
-                elif rule.risk_level.value == "medium" and assessment.risk_level == RiskLevel.LOW:
+        if self._dangerous_ac is not None:
+            hit = next(self._dangerous_ac.iter(cmd_l), None)
+            dangerous_cmd = hit[1] if hit else None
+        else:
+            dangerous_cmd = next(
+                (cmd for cmd in self.dangerous_commands if cmd in cmd_l), None
+            )
+
+        if dangerous_cmd:
+            assessment.risk_level = RiskLevel.CRITICAL
+            assessment.reasons.append(f"Contains dangerous pattern: {dangerous_cmd}")
+            assessment.blocked = True
+            return assessment
+
+        # All rule categories and the injection indicators come back from
+        # one scan over the command; reasons collect into a local list and
+        # land on the assessment in a single extend
+        reasons: List[str] = []
+        for rule_name in self._scan_rules(cmd_l):
+            if rule_name == _INJECTION_CATEGORY:
+                if assessment.risk_level < RiskLevel.MEDIUM:
                     assessment.risk_level = RiskLevel.MEDIUM
+                reasons.append("Contains potential command injection pattern")
+                continue
 
-                assessment.reasons.append(f"Matches rule: {rule.description}")
+            rule = self._rules_by_name[rule_name]
 
-        # Check for command injection patterns
-        injection_patterns = [
-            r";.*",      # Command chaining
-            r"\|.*",     # Piping
-            r"&&.*",     # Conditional execution
-            r"\$\(",     # Command substitution
-            r"`.*`",     # Backtick execution
-        ]
+            if rule.risk_level is RiskLevel.CRITICAL:
+                assessment.blocked = True
+            if rule.risk_level > assessment.risk_level:
+                assessment.risk_level = rule.risk_level
 
-        for pattern in injection_patterns:
-            if re.search(pattern, command):
-                if assessment.risk_level == RiskLevel.LOW:
-                    assessment.risk_level = RiskLevel.MEDIUM
-                assessment.reasons.append("Contains potential command injection pattern")
+            reasons.append(f"Matches rule: {rule.description}")
+
+        if reasons:
+            assessment.reasons.extend(reasons)
 
         return assessment
 
-    async def _assess_file_operation_risks(
+    def _scan_rules(self, command: str) -> Set[str]:
+        """Collect every matched rule category in a single pass.
+
+        Uses the hyperscan DFA when the binding is installed, otherwise
+        the combined alternation regex; either way the command bytes are
+        walked once for all categories.
+        """
+        matched: Set[str] = set()
+
+        if self._hs_db is not None:
+            def on_match(rule_id: int, start: int, end: int, flags: int, context: Any = None) -> None:
+                matched.add(self._hs_categories[rule_id])
+
+            self._hs_db.scan(command.encode(), match_event_handler=on_match)
+        else:
+            for match in self._combined_rule_re.finditer(command):
+                matched.add(match.lastgroup)
+
+        return matched
+
+    def _assess_file_operation_risks(
         self,
         arguments: Dict[str, Any],
         assessment: RiskAssessment
@@ -250,33 +435,27 @@ class RiskAssessor:
         operation = arguments.get("operation", "")
         path = arguments.get("path", "")
 
-        # Critical system paths
-        critical_paths = [
-            "/etc",
-            "/boot",
-            "/sys",
-            "/proc",
-            "/dev",
-            "/usr/bin",
-            "/usr/sbin",
-            "/bin",
-            "/sbin"
-        ]
+        reasons: List[str] = []
 
-        for critical_path in critical_paths:
-            if path.startswith(critical_path):
-                assessment.risk_level = RiskLevel.HIGH
-                assessment.reasons.append(f"Operation on critical system path: {critical_path}")
+        # str.startswith with a tuple checks all prefixes in one C call;
+        # the matching prefix is only recovered on the (rare) hit path
+        if path.startswith(_CRITICAL_PATHS):
+            critical_path = next(p for p in _CRITICAL_PATHS if path.startswith(p))
+            assessment.risk_level = RiskLevel.HIGH
+            reasons.append(f"Operation on critical system path: {critical_path}")
 
         # Destructive operations
         if operation in ["delete", "move"] and path == "/":
             assessment.risk_level = RiskLevel.CRITICAL
             assessment.blocked = True
-            assessment.reasons.append("Attempted operation on root directory")
+            reasons.append("Attempted operation on root directory")
+
+        if reasons:
+            assessment.reasons.extend(reasons)
 
         return assessment
 
-    async def _assess_service_risks(
+    def _assess_service_risks(
         self,
         arguments: Dict[str, Any],
         assessment: RiskAssessment
@@ -286,18 +465,7 @@ class RiskAssessor:
         service_name = arguments.get("service_name", "")
         action = arguments.get("action", "")
 
-        # Critical services
-        critical_services = [
-            "ssh",
-            "sshd",
-            "networking",
-            "network-manager",
-            "systemd-networkd",
-            "firewall",
-            "iptables"
-        ]
-
-        if service_name in critical_services:
+        if service_name in _CRITICAL_SERVICES:
             if action in ["stop", "disable"]:
                 assessment.risk_level = RiskLevel.HIGH
                 assessment.reasons.append(f"Stopping/disabling critical service: {service_name}")
@@ -306,19 +474,16 @@ class RiskAssessor:
 
     def is_whitelisted(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
         """Check if operation is whitelisted"""
-        whitelist = getattr(self.config, 'dangerous_commands_whitelist', [])
-
-        if tool_name == "execute_command":
-            command = arguments.get("command", "")
-            return command in whitelist
-
-        return False
+        return (
+            tool_name == "execute_command"
+            and arguments.get("command", "") in self._whitelist
+        )
 
-    async def should_block_operation(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
+    def should_block_operation(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
         """Determine if operation should be blocked"""
-        assessment_result = await self.assess_tool_call(tool_name, arguments)
+        level = self._assess_level(tool_name, arguments)
 
-        if assessment_result == "critical":
+        if level is RiskLevel.CRITICAL:
             return True
 
         if not self.config.enable_risk_assessment:
@@ -327,12 +492,11 @@ class RiskAssessor:
         if self.is_whitelisted(tool_name, arguments):
             return False
 
-        return assessment_result in ["high", "critical"]
+        return level >= RiskLevel.HIGH
 
-    async def requires_confirmation(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
+    def requires_confirmation(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
         """Determine if operation requires user confirmation"""
         if not self.config.require_confirmation:
             return False
 
-        assessment_result = await self.assess_tool_call(tool_name, arguments)
-        return assessment_result in ["medium", "high"]
\ No newline at end of file
+        return self._assess_level(tool_name, arguments) >= RiskLevel.MEDIUM
\ No newline at end of file
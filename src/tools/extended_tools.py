@@ -3,22 +3,537 @@ Extended MCP Tools for Advanced Linux Operations
 Comprehensive system administration tools
 """
 
+import array
 import asyncio
+import grp
 import json
 import logging
+import mmap
+import operator
 import os
+import pwd
 import re
+import shutil
+import stat
+import statistics
 import subprocess
+import threading
 import time
 from typing import Any, Dict, List, Optional
 
 import psutil
 from mcp.types import TextContent
 
+try:
+    import orjson  # optional: C-speed JSON serialization
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """Convert types orjson refuses to what the stdlib encoder emits.
+
+    orjson hands tuples — including psutil's namedtuples like pmem —
+    to this callback; rendering them as lists matches the JSON arrays
+    json.dumps produces natively instead of a str() repr.
+    """
+    if isinstance(obj, tuple):
+        return list(obj)
+    return str(obj)
+
+
+def _dumps(obj: Any) -> str:
+    """Render a tool result as indented JSON text.
+
+    Prefers orjson, whose native-code indent path sidesteps the stdlib
+    encoder's per-node Python overhead on large process lists; falls
+    back to json with equivalent options when orjson is absent.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2, default=_json_default
+        ).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+# All error indicators folded into one precompiled pattern: each log
+# line is scanned once instead of once per indicator, and matching on
+# bytes skips decoding lines that never hit. The named groups classify
+# the hit — match.lastgroup is the summary key, no decode needed
+_ERR_RX = re.compile(
+    rb"(?P<error>error)|(?P<fail>fail)|(?P<exception>exception)"
+    rb"|(?P<critical>critical)|(?P<fatal>fatal)|(?P<panic>panic)",
+    re.IGNORECASE
+)
+
+# Bound on stored log matches so a pathological journal cannot grow the
+# result without limit
+_MAX_LOG_MATCHES = 10000
+
+# Log files above this size are scanned via mmap instead of tail+pipe
+_LARGE_LOG_THRESHOLD = 8 * 1024 * 1024
+
+
+def _scan_log_mmap(
+    path: str,
+    error_patterns: List[Dict[str, str]],
+    pattern_counts: Dict[str, int],
+    max_matches: int = _MAX_LOG_MATCHES
+) -> None:
+    """Scan a large log file with one regex pass over mapped bytes.
+
+    The kernel pages the file in on demand, so no subprocess and no
+    line-splitting copy of the whole file. During the scan only line
+    offsets and pattern tokens are kept (compact arrays, no per-line
+    dict churn); the capped entry dicts are materialized at the end.
+    pattern_counts covers every matching line even past the cap.
+    """
+    starts = array.array('q')
+    ends = array.array('q')
+    tokens: List[str] = []
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            line_end = 0
+            for match in _ERR_RX.finditer(buf):
+                # Only the first indicator on a line counts, matching
+                # the streaming scanner's per-line semantics
+                if match.start() < line_end:
+                    continue
+                line_start = buf.rfind(b'\n', 0, match.start()) + 1
+                line_end = buf.find(b'\n', match.end())
+                if line_end == -1:
+                    line_end = len(buf)
+
+                matched = match.lastgroup
+                pattern_counts[matched] = pattern_counts.get(matched, 0) + 1
+                if len(tokens) < max_matches:
+                    starts.append(line_start)
+                    ends.append(line_end)
+                    tokens.append(matched)
+
+            # Materialize output dicts only for the stored entries,
+            # while the mapping is still open
+            for line_start, line_end, matched in zip(starts, ends, tokens):
+                error_patterns.append({
+                    "line": buf[line_start:line_end].decode('utf-8', 'replace').strip(),
+                    "pattern": matched
+                })
+
+
+# Pseudo-filesystems pruned from the world-writable walk plus the
+# bounds keeping the audit from running away on huge trees
+_AUDIT_PRUNE_DIRS = frozenset({"/proc", "/sys", "/dev", "/run"})
+_AUDIT_TIME_BUDGET = 30.0
+_AUDIT_MAX_FILES = 1000
+
+
+# Wall-clock budget for a backup run
+_BACKUP_TIMEOUT = 300
+
+
+async def _run_tar_pipeline(
+    tar_cmd: List[str],
+    compressor: Optional[List[str]],
+    out_path: str,
+    timeout: int = _BACKUP_TIMEOUT
+) -> "tuple[int, str]":
+    """Stream tar output through a compressor subprocess into out_path.
+
+    With compressor None, tar writes the archive bytes directly. Both
+    stages run as asyncio subprocesses so the event loop stays free, and
+    the kernel pipe lets archiving and compression overlap. Returns
+    (returncode, stderr) of the first failing stage, or (0, "").
+    """
+    procs = []
+    with open(out_path, 'wb') as out:
+        if compressor is None:
+            tar_proc = await asyncio.create_subprocess_exec(
+                *tar_cmd, stdout=out, stderr=asyncio.subprocess.PIPE
+            )
+            procs.append(tar_proc)
+        else:
+            read_fd, write_fd = os.pipe()
+            try:
+                tar_proc = await asyncio.create_subprocess_exec(
+                    *tar_cmd, stdout=write_fd, stderr=asyncio.subprocess.PIPE
+                )
+                procs.append(tar_proc)
+                comp_proc = await asyncio.create_subprocess_exec(
+                    *compressor,
+                    stdin=read_fd,
+                    stdout=out,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                procs.append(comp_proc)
+            finally:
+                # The children hold their own copies of the pipe ends
+                os.close(read_fd)
+                os.close(write_fd)
+
+    try:
+        outputs = await asyncio.wait_for(
+            asyncio.gather(*(proc.communicate() for proc in procs)),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        for proc in procs:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await asyncio.gather(*(proc.wait() for proc in procs))
+        raise
+
+    for proc, (_, stderr) in zip(procs, outputs):
+        if proc.returncode != 0:
+            return proc.returncode, stderr.decode('utf-8', 'replace')
+    return 0, ""
+
+
+# sshd_config checks memoized by (mtime_ns, size): the file rarely
+# changes, so repeated audits cost one stat() instead of a read+scan
+_SSH_CONFIG_CACHE: Dict[str, Any] = {"key": None, "checks": None}
+
+
+def _ssh_security_checks(path: str) -> Dict[str, bool]:
+    """Evaluate the sshd_config hardening checks, cached by file state."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    if _SSH_CONFIG_CACHE["key"] == key:
+        return _SSH_CONFIG_CACHE["checks"]
+
+    # Raw bytes: the substring tests are C-level and the ASCII config
+    # never needs decoding
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    checks = {
+        "root_login_disabled": b"PermitRootLogin no" in data,
+        "password_auth_disabled": b"PasswordAuthentication no" in data,
+        "protocol_2_only": b"Protocol 2" in data or b"Protocol 1" not in data
+    }
+    _SSH_CONFIG_CACHE["key"] = key
+    _SSH_CONFIG_CACHE["checks"] = checks
+    return checks
+
+
+def _find_world_writable(
+    root: str = "/",
+    time_budget: float = _AUDIT_TIME_BUDGET,
+    max_files: int = _AUDIT_MAX_FILES
+) -> "tuple[List[str], bool]":
+    """Collect world-writable regular files under root.
+
+    Iterative os.scandir walk reading dirents directly instead of
+    forking find(1). Returns (files, truncated); truncated is True when
+    the time budget or file cap cut the walk short.
+    """
+    deadline = time.monotonic() + time_budget
+    found: List[str] = []
+    stack = [root]
+    truncated = False
+
+    while stack:
+        if time.monotonic() > deadline or len(found) >= max_files:
+            truncated = True
+            break
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in _AUDIT_PRUNE_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            mode = entry.stat(follow_symlinks=False).st_mode
+                            if stat.S_IMODE(mode) & 0o002:
+                                found.append(entry.path)
+                                if len(found) >= max_files:
+                                    break
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return found, truncated
+
+
+# Shared snapshot of the full /proc scan: dashboard-style callers poll
+# the process tools back-to-back, so within the TTL window both scanners
+# filter the same cached rows instead of re-walking every PID
+_PROC_CACHE: Dict[str, Any] = {"ts": 0.0, "rows": None}
+_PROC_CACHE_TTL = 1.0
+
+# The scans run on executor threads via asyncio.to_thread; this lock
+# serializes refreshes so concurrent tool calls that both miss the TTL
+# don't interleave their mutations of _seen_rows/_ATTR_CACHE/_TICK_SAMPLE
+_PROC_SCAN_LOCK = threading.Lock()
+
+# Rows from the last scan keyed by pid: delta scans only instantiate
+# Process objects for pids that appeared since, merging the rest
+_seen_rows: Dict[int, Dict[str, Any]] = {}
+
+# Immutable per-process attributes cached across scans:
+# pid -> (create_time, username, cmdline, formatted create time).
+# create_time doubles as the pid-reuse detector — a recycled pid gets a
+# different create_time and re-reads everything
+_ATTR_CACHE: Dict[int, tuple] = {}
+
+# Multiplying by a precomputed reciprocal is cheaper than two divisions
+# per row
+_MB = 1.0 / 1048576.0
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Kernel clock ticks per second, for turning utime+stime deltas into
+# CPU seconds
+_CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+# Previous utime+stime sample per pid and when it was taken; the delta
+# between two columnar passes gives the delta path real CPU percentages
+# without any psutil.Process involvement
+_TICK_SAMPLE: Dict[str, Any] = {"ts": 0.0, "by_pid": {}}
+
+# Core counts never change at runtime; read them once at import
+_CPU_COUNTS = (psutil.cpu_count(logical=False), psutil.cpu_count(logical=True))
+
+
+def _proc_stat_columns() -> "tuple[array.array, array.array, array.array]":
+    """Read every /proc/<pid>/stat into parallel columns (SoA layout).
+
+    Returns (pids, rss_pages, cpu_ticks): one read and one split per
+    process, no Process objects or per-row dicts. rsplit on the ')'
+    closing the comm field survives spaces and parentheses in process
+    names. Stdlib array.array stands in for a columnar store since
+    numpy is not a dependency of this project.
+    """
+    pids = array.array('l')
+    rss_pages = array.array('q')
+    cpu_ticks = array.array('q')
+
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        # Raw fd syscalls: no BufferedReader object per pid, and stat
+        # contents always fit a single read
+        try:
+            fd = os.open(f"/proc/{name}/stat", os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            data = os.read(fd, 2048)
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
+        # Fields after the comm field are space-separated: utime and
+        # stime are fields 14/15, rss is field 24 (1-based)
+        fields = data.rsplit(b')', 1)[1].split()
+        pids.append(int(name))
+        cpu_ticks.append(int(fields[11]) + int(fields[12]))
+        rss_pages.append(int(fields[21]))
+
+    return pids, rss_pages, cpu_ticks
+
+
+def _scan_process_row(
+    proc: psutil.Process,
+    cpu_percent: Optional[float] = None,
+    memory_percent: Optional[float] = None
+) -> Dict[str, Any]:
+    """Read one process's attributes into a snapshot row.
+
+    Takes a psutil.Process rather than a pid: cpu_percent() measures the
+    delta since the last call on the *same instance* and returns 0.0 on a
+    fresh one, so callers must hand in an instance that persists across
+    scans (process_iter() keeps such a map internally). Callers that
+    already sampled cpu/memory percentages pass them in — re-calling
+    cpu_percent() here would reset the delta window and report ~0.
+
+    Raises psutil.NoSuchProcess/AccessDenied for unreadable pids.
+    """
+    pid = proc.pid
+    # oneshot() batches the /proc/<pid> reads behind these accessors
+    # into a single parse per process
+    with proc.oneshot():
+        if cpu_percent is None:
+            cpu_percent = proc.cpu_percent()
+        if memory_percent is None:
+            memory_percent = proc.memory_percent()
+        memory_info = proc.memory_info()
+        create_time = proc.create_time()
+
+        # username and cmdline never change for a live process, so
+        # steady-state scans take them from the cache; cmdline in
+        # particular is a separate proc file per read
+        cached = _ATTR_CACHE.get(pid)
+        if cached is not None and cached[0] == create_time:
+            _, username, cmdline, created_fmt = cached
+        else:
+            username = proc.username()
+            cmdline = proc.cmdline()
+            created_fmt = time.strftime(
+                '%Y-%m-%d %H:%M:%S', time.localtime(create_time)
+            )
+            _ATTR_CACHE[pid] = (create_time, username, cmdline, created_fmt)
+
+        return {
+            'pid': pid,
+            'name': proc.name(),
+            'username': username,
+            'cpu_percent': cpu_percent,
+            'memory_percent': memory_percent,
+            'memory_info': memory_info,
+            'memory_mb': memory_info.rss * _MB,
+            'create_time': create_time,
+            'create_time_formatted': created_fmt,
+            'status': proc.status(),
+            'num_threads': proc.num_threads(),
+            'cmdline': cmdline
+        }
+
+
+def _scan_filtered_processes(
+    filter_user: Optional[str],
+    min_cpu: float,
+    min_memory: float
+) -> List[Dict[str, Any]]:
+    """Two-stage scan with the filters pushed below attribute fetching.
+
+    Stage 1 reads only the uid and the cpu/memory percentages per pid;
+    the expensive attributes (cmdline in particular is its own proc
+    file) are fetched only for pids that survive the predicates, so a
+    selective filter skips most of the per-process work entirely.
+    Iterating process_iter() keeps the same Process instances alive
+    across calls, which is what makes the cpu_percent predicate see
+    real deltas rather than a fresh instance's constant 0.0.
+    """
+    uid = None
+    if filter_user:
+        try:
+            uid = pwd.getpwnam(filter_user).pw_uid
+        except KeyError:
+            return []
+
+    rows = []
+    # _scan_process_row writes _ATTR_CACHE, so this scan takes the same
+    # lock as the snapshot refresh rather than racing its eviction loop
+    with _PROC_SCAN_LOCK:
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    if uid is not None and proc.uids().real != uid:
+                        continue
+                    cpu = proc.cpu_percent()
+                    if cpu < min_cpu:
+                        continue
+                    memory = proc.memory_percent()
+                    if memory < min_memory:
+                        continue
+                # The survivor reuses the stage-1 instance and its
+                # sampled percentages instead of paying for a second
+                # /proc read
+                rows.append(_scan_process_row(proc, cpu, memory))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    return rows
+
+
+def _get_process_snapshot(
+    ttl: float = _PROC_CACHE_TTL,
+    delta_only: bool = False
+) -> List[Dict[str, Any]]:
+    """Scan /proc once and reuse the rows for up to ttl seconds.
+
+    With delta_only, a stale cache is refreshed by scanning only pids
+    that appeared since the previous snapshot and dropping exited ones;
+    surviving rows get their cpu/memory numbers refreshed from a single
+    columnar /proc pass and keep the rest of their attributes. Rows are
+    shared between callers and must not be mutated.
+
+    Thread-safe: a fresh cache is served lock-free, and expired entries
+    are refreshed under _PROC_SCAN_LOCK with a re-check, so concurrent
+    executor threads never run duplicate scans or interleave cache
+    mutations (same shape as _ttl_cache in the MCP server).
+    """
+    rows = _PROC_CACHE["rows"]
+    if rows is not None and time.monotonic() - _PROC_CACHE["ts"] < ttl:
+        return rows
+
+    with _PROC_SCAN_LOCK:
+        return _refresh_process_snapshot(ttl, delta_only)
+
+
+def _refresh_process_snapshot(
+    ttl: float,
+    delta_only: bool
+) -> List[Dict[str, Any]]:
+    """Rebuild the snapshot cache; caller must hold _PROC_SCAN_LOCK."""
+    # Another thread may have refreshed while this one waited on the lock
+    now = time.monotonic()
+    rows = _PROC_CACHE["rows"]
+    if rows is not None and now - _PROC_CACHE["ts"] < ttl:
+        return rows
+
+    if delta_only and _seen_rows:
+        # One direct columnar pass refreshes cpu/memory numbers for rows
+        # we are keeping and doubles as the pid enumeration, so surviving
+        # processes never re-instantiate a psutil.Process
+        pid_col, rss_col, tick_col = _proc_stat_columns()
+        total_memory = psutil.virtual_memory().total
+        elapsed = now - _TICK_SAMPLE["ts"]
+        prev_ticks = _TICK_SAMPLE["by_pid"]
+        next_ticks = {}
+        current = set(pid_col)
+        scan_pids = current - _seen_rows.keys()
+        for pid in _seen_rows.keys() - current:
+            del _seen_rows[pid]
+        for pid, rss, ticks in zip(pid_col, rss_col, tick_col):
+            next_ticks[pid] = ticks
+            row = _seen_rows.get(pid)
+            if row is not None:
+                rss_bytes = rss * _PAGE_SIZE
+                row['memory_mb'] = rss_bytes * _MB
+                row['memory_percent'] = rss_bytes * 100.0 / total_memory
+                last = prev_ticks.get(pid)
+                # ticks < last means the pid was recycled between passes;
+                # skip rather than report a negative percentage
+                if last is not None and ticks >= last and elapsed > 0.0:
+                    row['cpu_percent'] = (
+                        (ticks - last) * 100.0 / (_CLK_TCK * elapsed)
+                    )
+        _TICK_SAMPLE["ts"] = now
+        _TICK_SAMPLE["by_pid"] = next_ticks
+        for pid in scan_pids:
+            try:
+                _seen_rows[pid] = _scan_process_row(psutil.Process(pid))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    else:
+        _seen_rows.clear()
+        # process_iter() reuses its internal per-pid instance map, so
+        # cpu_percent() yields a real delta against the previous scan
+        # instead of the 0.0 a freshly built Process reports
+        for proc in psutil.process_iter():
+            try:
+                _seen_rows[proc.pid] = _scan_process_row(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+    # Attribute-cache entries for exited pids would otherwise pile up
+    for pid in _ATTR_CACHE.keys() - _seen_rows.keys():
+        del _ATTR_CACHE[pid]
+
+    rows = list(_seen_rows.values())
+    _PROC_CACHE["ts"] = now
+    _PROC_CACHE["rows"] = rows
+    return rows
+
+
 class ExtendedSystemTools:
     """Extended system tools for comprehensive Linux administration"""
 
@@ -27,17 +542,10 @@ class ExtendedSystemTools:
         """Advanced process management and analysis"""
         try:
             operation = args.get("operation", "list")
-
-            if operation == "list":
-                return await ExtendedSystemTools._list_processes_detailed(args)
-            elif operation == "analyze":
-                return await ExtendedSystemTools._analyze_process_tree(args)
-            elif operation == "kill":
-                return await ExtendedSystemTools._terminate_process_safe(args)
-            elif operation == "resource_hogs":
-                return await ExtendedSystemTools._find_resource_hogs(args)
-            else:
+            handler = _PROCESS_OPS.get(operation)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown operation: {operation}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in process management: {str(e)}")]
@@ -48,39 +556,25 @@ class ExtendedSystemTools:
         filter_user = args.get("user")
         min_cpu = args.get("min_cpu", 0)
         min_memory = args.get("min_memory", 0)
+        delta_only = args.get("delta_only", False)
+
+        # Unfiltered listings reuse the shared snapshot; with filters
+        # set, a pushdown scan builds rows only for surviving pids.
+        # Either way the /proc walk runs on a worker thread so the
+        # event loop keeps serving other tool calls
+        if not filter_user and min_cpu <= 0 and min_memory <= 0:
+            processes = list(await asyncio.to_thread(
+                _get_process_snapshot, delta_only=delta_only
+            ))
+        else:
+            processes = await asyncio.to_thread(
+                _scan_filtered_processes, filter_user, min_cpu, min_memory
+            )
 
-        processes = []
-        for proc in psutil.process_iter([
-            'pid', 'name', 'username', 'cpu_percent', 'memory_percent',
-            'memory_info', 'create_time', 'status', 'num_threads', 'cmdline'
-        ]):
-            try:
-                pinfo = proc.info
-
-                # Apply filters
-                if filter_user and pinfo['username'] != filter_user:
-                    continue
-                if pinfo['cpu_percent'] < min_cpu:
-                    continue
-                if pinfo['memory_percent'] < min_memory:
-                    continue
-
-                # Add additional info
-                pinfo['create_time_formatted'] = time.strftime(
-                    '%Y-%m-%d %H:%M:%S',
-                    time.localtime(pinfo['create_time'])
-                )
-                pinfo['memory_mb'] = pinfo['memory_info'].rss / 1024 / 1024
-
-                processes.append(pinfo)
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-
-        # Sort by CPU usage
-        processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
+        # Sort by CPU usage (itemgetter keeps the key function in C)
+        processes.sort(key=operator.itemgetter('cpu_percent'), reverse=True)
 
-        return [TextContent(type="text", text=json.dumps(processes, indent=2, default=str))]
+        return [TextContent(type="text", text=_dumps(processes))]
 
     @staticmethod
     async def _find_resource_hogs(args: Dict[str, Any]) -> List[TextContent]:
@@ -94,49 +588,57 @@ class ExtendedSystemTools:
             "combined_hogs": []
         }
 
-        for proc in psutil.process_iter([
-            'pid', 'name', 'cpu_percent', 'memory_percent', 'username'
-        ]):
-            try:
-                pinfo = proc.info
+        half_cpu = cpu_threshold / 2
+        half_memory = memory_threshold / 2
 
-                if pinfo['cpu_percent'] > cpu_threshold:
-                    resource_hogs["cpu_hogs"].append(pinfo)
+        # Filter the shared snapshot (refreshed off the event loop): the
+        # cheap threshold checks run on every row, the output dict is
+        # built only for crossers
+        for row in await asyncio.to_thread(_get_process_snapshot):
+            cpu = row['cpu_percent']
+            memory = row['memory_percent']
 
-                if pinfo['memory_percent'] > memory_threshold:
-                    resource_hogs["memory_hogs"].append(pinfo)
+            if not (cpu > cpu_threshold or memory > memory_threshold
+                    or (cpu > half_cpu and memory > half_memory)):
+                continue
 
-                if (pinfo['cpu_percent'] > cpu_threshold/2 and
-                    pinfo['memory_percent'] > memory_threshold/2):
-                    resource_hogs["combined_hogs"].append(pinfo)
+            pinfo = {
+                'pid': row['pid'],
+                'name': row['name'],
+                'cpu_percent': cpu,
+                'memory_percent': memory,
+                'username': row['username']
+            }
 
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+            if cpu > cpu_threshold:
+                resource_hogs["cpu_hogs"].append(pinfo)
 
-        return [TextContent(type="text", text=json.dumps(resource_hogs, indent=2))]
+            if memory > memory_threshold:
+                resource_hogs["memory_hogs"].append(pinfo)
+
+            if cpu > half_cpu and memory > half_memory:
+                resource_hogs["combined_hogs"].append(pinfo)
+
+        return [TextContent(type="text", text=_dumps(resource_hogs))]
 
     @staticmethod
     async def system_performance_analysis(args: Dict[str, Any]) -> List[TextContent]:
         """Comprehensive system performance analysis"""
         try:
             analysis_type = args.get("type", "full")
-            duration = args.get("duration", 10)
-
-            if analysis_type == "full":
-                return await ExtendedSystemTools._full_performance_analysis(duration)
-            elif analysis_type == "io":
-                return await ExtendedSystemTools._io_performance_analysis(duration)
-            elif analysis_type == "network":
-                return await ExtendedSystemTools._network_performance_analysis(duration)
-            else:
+            handler = _PERFORMANCE_OPS.get(analysis_type)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown analysis type: {analysis_type}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in performance analysis: {str(e)}")]
 
     @staticmethod
-    async def _full_performance_analysis(duration: int) -> List[TextContent]:
+    async def _full_performance_analysis(args: Dict[str, Any]) -> List[TextContent]:
         """Full system performance analysis"""
+        duration = args.get("duration", 10)
+
         analysis_results = {
             "analysis_duration": duration,
             "timestamp": time.time(),
@@ -148,7 +650,11 @@ class ExtendedSystemTools:
 
         # CPU Analysis
         cpu_before = psutil.cpu_times()
-        cpu_percent_samples = []
+        # Preallocated so the sampling loop only index-assigns
+        cpu_percent_samples = [0.0] * duration
+        # Prime the non-blocking cpu_percent form so the first sampled
+        # delta below covers a real interval
+        psutil.cpu_percent(interval=None)
 
         # Memory Analysis
         memory = psutil.virtual_memory()
@@ -165,9 +671,12 @@ class ExtendedSystemTools:
         # Network Analysis
         net_io_before = psutil.net_io_counters()
 
-        # Sample data over duration
+        # Sample data over duration; sleeping on the event loop instead
+        # of inside psutil keeps other tool requests progressing during
+        # the measurement window
         for i in range(duration):
-            cpu_percent_samples.append(psutil.cpu_percent(interval=1))
+            await asyncio.sleep(1.0)
+            cpu_percent_samples[i] = psutil.cpu_percent(interval=None)
 
         # Final measurements
         cpu_after = psutil.cpu_times()
@@ -176,12 +685,12 @@ class ExtendedSystemTools:
 
         # CPU analysis results
         analysis_results["cpu_analysis"] = {
-            "average_usage": sum(cpu_percent_samples) / len(cpu_percent_samples),
+            "average_usage": statistics.fmean(cpu_percent_samples),
             "max_usage": max(cpu_percent_samples),
             "min_usage": min(cpu_percent_samples),
             "samples": cpu_percent_samples,
-            "cores": psutil.cpu_count(),
-            "logical_cores": psutil.cpu_count(logical=True)
+            "cores": _CPU_COUNTS[0],
+            "logical_cores": _CPU_COUNTS[1]
         }
 
         # Disk I/O analysis
@@ -202,73 +711,49 @@ class ExtendedSystemTools:
                 "packets_recv_per_sec": (net_io_after.packets_recv - net_io_before.packets_recv) / duration
             }
 
-        return [TextContent(type="text", text=json.dumps(analysis_results, indent=2, default=str))]
+        return [TextContent(type="text", text=_dumps(analysis_results))]
 
     @staticmethod
     async def security_audit_tools(args: Dict[str, Any]) -> List[TextContent]:
         """Security audit and compliance checking tools"""
         try:
             audit_type = args.get("type", "basic")
-
-            if audit_type == "basic":
-                return await ExtendedSystemTools._basic_security_audit()
-            elif audit_type == "permissions":
-                return await ExtendedSystemTools._file_permissions_audit(args)
-            elif audit_type == "network":
-                return await ExtendedSystemTools._network_security_audit()
-            elif audit_type == "users":
-                return await ExtendedSystemTools._user_security_audit()
-            else:
+            handler = _AUDIT_OPS.get(audit_type)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown audit type: {audit_type}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in security audit: {str(e)}")]
 
     @staticmethod
-    async def _basic_security_audit() -> List[TextContent]:
+    async def _basic_security_audit(args: Dict[str, Any]) -> List[TextContent]:
         """Basic security audit checks"""
         audit_results = {
             "timestamp": time.time(),
             "checks": []
         }
 
-        # Check for world-writable files
-        try:
-            result = subprocess.run(
-                ["find", "/", "-type", "f", "-perm", "-002", "2>/dev/null"],
-                capture_output=True, text=True, timeout=30
-            )
-            world_writable = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            audit_results["checks"].append({
-                "name": "world_writable_files",
-                "status": "pass" if not world_writable else "fail",
-                "count": len(world_writable),
-                "files": world_writable[:10]  # First 10 files
-            })
-        except subprocess.TimeoutExpired:
-            audit_results["checks"].append({
-                "name": "world_writable_files",
-                "status": "timeout",
-                "error": "Search timed out"
-            })
+        # Check for world-writable files (the old find(1) shellout was
+        # broken: with shell=False its "2>/dev/null" tail was passed as a
+        # literal path argument)
+        world_writable, truncated = await asyncio.to_thread(_find_world_writable)
+        audit_results["checks"].append({
+            "name": "world_writable_files",
+            "status": "pass" if not world_writable else "fail",
+            "count": len(world_writable),
+            "truncated": truncated,
+            "files": world_writable[:10]  # First 10 files
+        })
 
         # Check SSH configuration
         ssh_config_path = "/etc/ssh/sshd_config"
         if os.path.exists(ssh_config_path):
             try:
-                with open(ssh_config_path, 'r') as f:
-                    ssh_config = f.read()
-
-                ssh_checks = {
-                    "root_login_disabled": "PermitRootLogin no" in ssh_config,
-                    "password_auth_disabled": "PasswordAuthentication no" in ssh_config,
-                    "protocol_2_only": "Protocol 2" in ssh_config or "Protocol 1" not in ssh_config
-                }
-
                 audit_results["checks"].append({
                     "name": "ssh_security",
                     "status": "checked",
-                    "details": ssh_checks
+                    "details": _ssh_security_checks(ssh_config_path)
                 })
             except Exception as e:
                 audit_results["checks"].append({
@@ -277,19 +762,18 @@ class ExtendedSystemTools:
                     "error": str(e)
                 })
 
-        # Check for sudo access
+        # Check for sudo access: grp queries NSS in-process, same data
+        # as getent without the fork+exec and text parsing
         try:
-            result = subprocess.run(
-                ["getent", "group", "sudo"],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                sudo_users = result.stdout.strip().split(':')[-1].split(',') if result.stdout.strip() else []
-                audit_results["checks"].append({
-                    "name": "sudo_users",
-                    "status": "checked",
-                    "users": [u.strip() for u in sudo_users if u.strip()]
-                })
+            audit_results["checks"].append({
+                "name": "sudo_users",
+                "status": "checked",
+                "users": list(grp.getgrnam("sudo").gr_mem)
+            })
+        except KeyError:
+            # No sudo group on this system (e.g. wheel-based distros);
+            # matches the old behavior of skipping the check
+            pass
         except Exception as e:
             audit_results["checks"].append({
                 "name": "sudo_users",
@@ -297,32 +781,27 @@ class ExtendedSystemTools:
                 "error": str(e)
             })
 
-        return [TextContent(type="text", text=json.dumps(audit_results, indent=2))]
+        return [TextContent(type="text", text=_dumps(audit_results))]
 
     @staticmethod
     async def log_analysis_tools(args: Dict[str, Any]) -> List[TextContent]:
         """Advanced log analysis and monitoring tools"""
         try:
             analysis_type = args.get("type", "errors")
-            log_file = args.get("log_file")
-            pattern = args.get("pattern")
-            time_range = args.get("time_range", "1h")
-
-            if analysis_type == "errors":
-                return await ExtendedSystemTools._analyze_error_logs(log_file, time_range)
-            elif analysis_type == "pattern":
-                return await ExtendedSystemTools._search_log_patterns(log_file, pattern)
-            elif analysis_type == "summary":
-                return await ExtendedSystemTools._log_summary_analysis(log_file, time_range)
-            else:
+            handler = _LOG_OPS.get(analysis_type)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown analysis type: {analysis_type}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in log analysis: {str(e)}")]
 
     @staticmethod
-    async def _analyze_error_logs(log_file: Optional[str], time_range: str) -> List[TextContent]:
+    async def _analyze_error_logs(args: Dict[str, Any]) -> List[TextContent]:
         """Analyze system logs for errors and warnings"""
+        log_file = args.get("log_file")
+        time_range = args.get("time_range", "1h")
+
         analysis_results = {
             "time_range": time_range,
             "error_patterns": [],
@@ -330,6 +809,28 @@ class ExtendedSystemTools:
             "critical_events": []
         }
 
+        pattern_counts: Dict[str, int] = {}
+        error_patterns = analysis_results["error_patterns"]
+
+        # Big log files skip the tail subprocess entirely: one mmap'd
+        # regex pass over the raw bytes covers the whole file
+        if log_file:
+            try:
+                large = os.path.getsize(log_file) > _LARGE_LOG_THRESHOLD
+            except OSError as e:
+                analysis_results["error"] = str(e)
+                return [TextContent(type="text", text=_dumps(analysis_results))]
+            if large:
+                try:
+                    await asyncio.to_thread(
+                        _scan_log_mmap, log_file, error_patterns, pattern_counts
+                    )
+                    analysis_results["pattern_summary"] = pattern_counts
+                    analysis_results["total_errors"] = len(error_patterns)
+                except Exception as e:
+                    analysis_results["error"] = str(e)
+                return [TextContent(type="text", text=_dumps(analysis_results))]
+
         # Use journalctl if no specific log file provided
         if not log_file:
             cmd = ["journalctl", f"--since={time_range}", "-p", "err"]
@@ -337,71 +838,68 @@ class ExtendedSystemTools:
             # Analyze specific log file
             cmd = ["tail", "-n", "1000", log_file]
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            log_lines = result.stdout.split('\n')
-
-            # Error patterns to look for
-            error_patterns = [
-                r'(?i)error',
-                r'(?i)fail',
-                r'(?i)exception',
-                r'(?i)critical',
-                r'(?i)fatal',
-                r'(?i)panic'
-            ]
-
-            for line in log_lines:
-                for pattern in error_patterns:
-                    if re.search(pattern, line):
-                        analysis_results["error_patterns"].append({
-                            "line": line.strip(),
-                            "pattern": pattern
-                        })
+        async def _consume(stream) -> None:
+            # One search per line against the combined alternation as the
+            # pipe fills; only matching lines pay for a decode
+            async for line in stream:
+                match = _ERR_RX.search(line)
+                if match:
+                    matched = match.lastgroup
+                    error_patterns.append({
+                        "line": line.decode('utf-8', 'replace').strip(),
+                        "pattern": matched
+                    })
+                    pattern_counts[matched] = pattern_counts.get(matched, 0) + 1
+                    if len(error_patterns) >= _MAX_LOG_MATCHES:
                         break
 
-            # Count patterns
-            pattern_counts = {}
-            for entry in analysis_results["error_patterns"]:
-                pattern = entry["pattern"]
-                pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            try:
+                await asyncio.wait_for(_consume(proc.stdout), timeout=30)
+            except asyncio.TimeoutError:
+                analysis_results["error"] = "Log analysis timed out"
+            finally:
+                # Stop the producer if it is still running (timeout or
+                # match cap); kill on an already-exited child is a no-op
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
 
             analysis_results["pattern_summary"] = pattern_counts
-            analysis_results["total_errors"] = len(analysis_results["error_patterns"])
+            analysis_results["total_errors"] = len(error_patterns)
 
-        except subprocess.TimeoutExpired:
-            analysis_results["error"] = "Log analysis timed out"
         except Exception as e:
             analysis_results["error"] = str(e)
 
-        return [TextContent(type="text", text=json.dumps(analysis_results, indent=2))]
+        return [TextContent(type="text", text=_dumps(analysis_results))]
 
     @staticmethod
     async def backup_and_recovery_tools(args: Dict[str, Any]) -> List[TextContent]:
         """Backup and recovery management tools"""
         try:
             operation = args.get("operation", "create")
-            source_path = args.get("source_path")
-            backup_path = args.get("backup_path")
-            compression = args.get("compression", "gzip")
-
-            if operation == "create":
-                return await ExtendedSystemTools._create_backup(source_path, backup_path, compression)
-            elif operation == "restore":
-                return await ExtendedSystemTools._restore_backup(backup_path, source_path)
-            elif operation == "verify":
-                return await ExtendedSystemTools._verify_backup(backup_path)
-            elif operation == "list":
-                return await ExtendedSystemTools._list_backups(backup_path)
-            else:
+            handler = _BACKUP_OPS.get(operation)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown operation: {operation}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in backup operation: {str(e)}")]
 
     @staticmethod
-    async def _create_backup(source_path: str, backup_path: str, compression: str) -> List[TextContent]:
+    async def _create_backup(args: Dict[str, Any]) -> List[TextContent]:
         """Create system backup"""
+        source_path = args.get("source_path")
+        backup_path = args.get("backup_path")
+        compression = args.get("compression", "zstd")
+
         if not source_path or not backup_path:
             return [TextContent(type="text", text="Source and backup paths are required")]
 
@@ -412,29 +910,49 @@ class ExtendedSystemTools:
             "compression": compression
         }
 
-        # Create backup filename with timestamp
+        # Create backup filename with timestamp; compression runs as a
+        # separate pipeline stage so a parallel compressor can be used
+        # when one is installed
         backup_filename = f"backup_{backup_info['timestamp']}.tar"
-        if compression == "gzip":
+        if compression == "zstd":
+            # Default: zstd matches gzip's ratio at several times the
+            # throughput and -T0 spreads the work over all cores; fall
+            # back to gzip when the binary is absent
+            zstd = shutil.which("zstd")
+            if zstd:
+                backup_filename += ".zst"
+                compressor = [zstd, "-T0", "-q"]
+            else:
+                backup_filename += ".gz"
+                compressor = ["gzip"]
+                backup_info["compression"] = "gzip"
+        elif compression == "gzip":
             backup_filename += ".gz"
-            tar_option = "czf"
+            pigz = shutil.which("pigz")
+            compressor = [pigz, "-p", str(os.cpu_count() or 1)] if pigz else ["gzip"]
         elif compression == "bzip2":
             backup_filename += ".bz2"
-            tar_option = "cjf"
+            compressor = ["bzip2"]
         else:
-            tar_option = "cf"
+            compressor = None
 
         full_backup_path = os.path.join(backup_path, backup_filename)
 
+        tar_cmd = [
+            "tar", "-cf", "-",
+            "-C", os.path.dirname(source_path),
+            os.path.basename(source_path)
+        ]
+
         try:
             # Ensure backup directory exists
             os.makedirs(backup_path, exist_ok=True)
 
-            # Create backup
-            cmd = ["tar", tar_option, full_backup_path, "-C", os.path.dirname(source_path), os.path.basename(source_path)]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            returncode, error = await _run_tar_pipeline(
+                tar_cmd, compressor, full_backup_path
+            )
 
-            if result.returncode == 0:
+            if returncode == 0:
                 # Get backup file info
                 stat_info = os.stat(full_backup_path)
                 backup_info.update({
@@ -446,10 +964,10 @@ class ExtendedSystemTools:
             else:
                 backup_info.update({
                     "status": "failed",
-                    "error": result.stderr
+                    "error": error
                 })
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             backup_info.update({
                 "status": "failed",
                 "error": "Backup operation timed out"
@@ -460,30 +978,23 @@ class ExtendedSystemTools:
                 "error": str(e)
             })
 
-        return [TextContent(type="text", text=json.dumps(backup_info, indent=2))]
+        return [TextContent(type="text", text=_dumps(backup_info))]
 
     @staticmethod
     async def container_management_tools(args: Dict[str, Any]) -> List[TextContent]:
         """Docker and container management tools"""
         try:
             operation = args.get("operation", "list")
-
-            if operation == "list":
-                return await ExtendedSystemTools._list_containers()
-            elif operation == "stats":
-                return await ExtendedSystemTools._container_stats()
-            elif operation == "logs":
-                return await ExtendedSystemTools._container_logs(args)
-            elif operation == "cleanup":
-                return await ExtendedSystemTools._cleanup_containers()
-            else:
+            handler = _CONTAINER_OPS.get(operation)
+            if handler is None:
                 return [TextContent(type="text", text=f"Unknown operation: {operation}")]
+            return await handler(args)
 
         except Exception as e:
             return [TextContent(type="text", text=f"Error in container management: {str(e)}")]
 
     @staticmethod
-    async def _list_containers() -> List[TextContent]:
+    async def _list_containers(args: Dict[str, Any]) -> List[TextContent]:
         """List Docker containers"""
         try:
             # Check if Docker is available
@@ -503,4 +1014,61 @@ class ExtendedSystemTools:
         except subprocess.TimeoutExpired:
             return [TextContent(type="text", text="Container listing timed out")]
         except Exception as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
\ No newline at end of file
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+def _resolve_ops(mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Build an operation routing table from handler names.
+
+    Handlers not yet implemented in this module resolve to None and are
+    left out, so their operations fall through to the unknown-operation
+    message instead of failing at import time.
+    """
+    resolved = {}
+    for op, name in mapping.items():
+        handler = getattr(ExtendedSystemTools, name, None)
+        if handler is not None:
+            resolved[op] = handler
+    return resolved
+
+
+# Every handler takes the tool's args dict, so each top-level tool is a
+# single dict lookup plus one await
+_PROCESS_OPS = _resolve_ops({
+    "list": "_list_processes_detailed",
+    "analyze": "_analyze_process_tree",
+    "kill": "_terminate_process_safe",
+    "resource_hogs": "_find_resource_hogs"
+})
+
+_PERFORMANCE_OPS = _resolve_ops({
+    "full": "_full_performance_analysis",
+    "io": "_io_performance_analysis",
+    "network": "_network_performance_analysis"
+})
+
+_AUDIT_OPS = _resolve_ops({
+    "basic": "_basic_security_audit",
+    "permissions": "_file_permissions_audit",
+    "network": "_network_security_audit",
+    "users": "_user_security_audit"
+})
+
+_LOG_OPS = _resolve_ops({
+    "errors": "_analyze_error_logs",
+    "pattern": "_search_log_patterns",
+    "summary": "_log_summary_analysis"
+})
+
+_BACKUP_OPS = _resolve_ops({
+    "create": "_create_backup",
+    "restore": "_restore_backup",
+    "verify": "_verify_backup",
+    "list": "_list_backups"
+})
+
+_CONTAINER_OPS = _resolve_ops({
+    "list": "_list_containers",
+    "stats": "_container_stats",
+    "logs": "_container_logs",
+    "cleanup": "_cleanup_containers"
+})
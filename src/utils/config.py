@@ -10,6 +10,10 @@ from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 
+# 程序內共用的配置快取：避免每次 from_env 都重新讀取 .env 並重建模型
+_cached_config: Optional["Config"] = None
+
+
 class Config(BaseModel):
     """MCP AI Agent 配置設定類別"""
 
@@ -26,6 +30,9 @@ class Config(BaseModel):
     require_confirmation: bool = Field(default=True, description="危險操作需要確認")
     dangerous_commands_whitelist: list = Field(default_factory=list, description="危險命令白名單")
 
+    # 執行配置
+    thread_pool_workers: int = Field(default=32, description="阻塞式掃描使用的執行緒池大小")
+
     # 監控配置
     monitoring_interval: int = Field(default=30, description="監控間隔（秒）")
     cpu_threshold: float = Field(default=80.0, description="CPU 使用率告警閾值")
@@ -37,8 +44,16 @@ class Config(BaseModel):
     log_file: Optional[str] = Field(default=None, description="日誌檔案路徑")
 
     @classmethod
-    def from_env(cls) -> "Config":
-        """從環境變數載入配置"""
+    def from_env(cls, reload: bool = False) -> "Config":
+        """從環境變數載入配置
+
+        結果會在程序內快取，後續呼叫直接回傳同一個配置物件；
+        傳入 reload=True 可強制重新讀取環境變數。
+        """
+        global _cached_config
+        if _cached_config is not None and not reload:
+            return _cached_config
+
         load_dotenv()
 
         # 必要欄位
@@ -54,6 +69,7 @@ class Config(BaseModel):
             "mcp_server_port": int(os.getenv("MCP_SERVER_PORT", "8080")),
             "enable_risk_assessment": os.getenv("ENABLE_RISK_ASSESSMENT", "true").lower() == "true",
             "require_confirmation": os.getenv("REQUIRE_CONFIRMATION", "true").lower() == "true",
+            "thread_pool_workers": int(os.getenv("THREAD_POOL_WORKERS", "32")),
             "monitoring_interval": int(os.getenv("MONITORING_INTERVAL", "30")),
             "cpu_threshold": float(os.getenv("CPU_THRESHOLD", "80.0")),
             "memory_threshold": float(os.getenv("MEMORY_THRESHOLD", "85.0")),
@@ -69,4 +85,14 @@ class Config(BaseModel):
                 cmd.strip() for cmd in whitelist_str.split(",") if cmd.strip()
             ]
 
-        return cls(**config_dict)
\ No newline at end of file
+        _cached_config = cls(**config_dict)
+        return _cached_config
+
+
+def get_config() -> Config:
+    """取得程序內共用的配置單例
+
+    與 Config.from_env() 共用同一份快取，提供給不需要 Config 類別
+    本身的呼叫端一個更輕量的入口。
+    """
+    return Config.from_env()
\ No newline at end of file